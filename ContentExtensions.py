@@ -1,26 +1,19 @@
 import logging
-from keybert import KeyBERT
-from textblob import TextBlob
-from transformers import pipeline
-from langchain_openai import ChatOpenAI
-from langchain.docstore.document import Document
-from langchain.prompts import PromptTemplate
+import os
 import time as tme
 from contextlib import contextmanager
-from dotenv import dotenv_values
-import tiktoken
-from langchain.chains.combine_documents.stuff import StuffDocumentsChain
-from langchain.chains.llm import LLMChain
-from langchain.chains import MapReduceDocumentsChain, ReduceDocumentsChain
-from langchain.text_splitter import (
-    RecursiveCharacterTextSplitter,
-    CharacterTextSplitter,
-)
+from functools import cached_property
+
+# transformers, keybert, langchain and tiktoken take seconds to import, so they
+# are imported inside the methods that need them rather than at module load
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-test = dotenv_values("C:\\Users\\Brett\\OneDrive\\Desktop\\RTP-Radar\\.env")
+# RTP_RADAR_ENV points at a .env elsewhere; otherwise the one next to this file is used
+default_env_file = os.environ.get(
+    "RTP_RADAR_ENV", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+)
 
 
 @contextmanager
@@ -48,11 +41,19 @@ class ContentExtender:
             "fayetteville",
             "crabtree",
         ]
-        self.kw_model = KeyBERT()
         self.hf_max_length = 512
         self.hf_truncation = True
 
+    @cached_property
+    def kw_model(self):
+        with timer("Loading KeyBERT model"):
+            from keybert import KeyBERT
+
+            return KeyBERT()
+
     def get_nouns(self, content_list):
+        from textblob import TextBlob
+
         with timer("Extracting Nouns from Content"):
             return [TextBlob(content).noun_phrases for content in content_list]
 
@@ -65,6 +66,8 @@ class ContentExtender:
 
     def set_hf_pipeline(self, task, model):
         with timer(f"Loading HuggingFace Pipeline for {task}"):
+            from transformers import pipeline
+
             return pipeline(
                 task=task,
                 model=model,
@@ -81,7 +84,8 @@ class ContentExtender:
 
 
 class ContentSummarizer:
-    def __init__(self):
+    def __init__(self, env_file=default_env_file):
+        self.env_file = env_file
         self.standard_template = """
         You are a new reporter for news related to the Research Triangle Park area in North Carolina. Your job is to summarize articles and reddit posts that originate from the Research Triangle Park area.
         For every 250-300 word summary outlining the main points of each article or reddit post you will get paid an additional $200. 
@@ -105,22 +109,7 @@ class ContentSummarizer:
 
         self.document_template = """"""
 
-        self.standard_prompt = PromptTemplate.from_template(self.standard_template)
-        self.map_prompt = PromptTemplate.from_template(self.map_template)
-        self.reduce_prompt = PromptTemplate.from_template(self.reduce_template)
-
         self.openai_modelname = "gpt-3.5-turbo-0125"
-        self.model = ChatOpenAI(
-            openai_api_key=test["OPENAI_API_KEY"],
-            model_name=self.openai_modelname,
-            temperature=0.5,
-        )
-        self.text_splitter = CharacterTextSplitter.from_tiktoken_encoder(
-            model_name=self.openai_modelname, chunk_size=1000, chunk_overlap=0
-        )
-        self.doc_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            model_name=self.openai_modelname, chunk_size=1000, chunk_overlap=15
-        )
         self.verbose = True
         self.functions = [
             {
@@ -139,6 +128,64 @@ class ContentSummarizer:
             }
         ]
 
+    @cached_property
+    def config(self):
+        with timer(f"Loading {self.env_file}"):
+            from dotenv import dotenv_values
+
+            return dotenv_values(self.env_file)
+
+    @cached_property
+    def standard_prompt(self):
+        from langchain.prompts import PromptTemplate
+
+        return PromptTemplate.from_template(self.standard_template)
+
+    @cached_property
+    def map_prompt(self):
+        from langchain.prompts import PromptTemplate
+
+        return PromptTemplate.from_template(self.map_template)
+
+    @cached_property
+    def reduce_prompt(self):
+        from langchain.prompts import PromptTemplate
+
+        return PromptTemplate.from_template(self.reduce_template)
+
+    @cached_property
+    def model(self):
+        with timer("Loading OpenAI chat model"):
+            from langchain_openai import ChatOpenAI
+
+            return ChatOpenAI(
+                openai_api_key=self.config["OPENAI_API_KEY"],
+                model_name=self.openai_modelname,
+                temperature=0.5,
+            )
+
+    @cached_property
+    def text_splitter(self):
+        from langchain.text_splitter import CharacterTextSplitter
+
+        return CharacterTextSplitter.from_tiktoken_encoder(
+            model_name=self.openai_modelname, chunk_size=1000, chunk_overlap=0
+        )
+
+    @cached_property
+    def doc_splitter(self):
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            model_name=self.openai_modelname, chunk_size=1000, chunk_overlap=15
+        )
+
+    @cached_property
+    def encoding(self):
+        import tiktoken
+
+        return tiktoken.encoding_for_model(self.openai_modelname)
+
     def get_summaries(self, content):
         with timer("Generating Summaries of Content"):
             chain = self.get_chain()
@@ -150,12 +197,15 @@ class ContentSummarizer:
 
     def num_tokens_from_string(self, string: str) -> int:
         with timer("Calculating Number of Tokens"):
-            encoding = tiktoken.encoding_for_model(self.openai_modelname)
-            num_tokens = len(encoding.encode(string))
+            num_tokens = len(self.encoding.encode(string))
             return num_tokens
 
     def set_chain(self, chain_type):
         with timer(f"Setting {chain_type} Chain"):
+            from langchain.chains.combine_documents.stuff import StuffDocumentsChain
+            from langchain.chains.llm import LLMChain
+            from langchain.chains import MapReduceDocumentsChain, ReduceDocumentsChain
+
             if chain_type == "stuff":
                 standard_chain = LLMChain(
                     llm=self.model.bind(
@@ -201,6 +251,8 @@ class ContentSummarizer:
 
     def make_docs(self, content):
         with timer("Splitting Long content into multiple docs"):
+            from langchain.docstore.document import Document
+
             texts = self.text_splitter.split_text(content)
             temp_docs = self.text_splitter.create_documents(texts)
             docs = self.doc_splitter.split_documents(temp_docs)
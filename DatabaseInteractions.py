@@ -1,7 +1,10 @@
 from configparser import ConfigParser
+from datetime import datetime
+from typing import Optional
 import psycopg2
 import pandas as pd
 import psycopg2.extras as extras
+from psycopg2 import sql
 from contextlib import contextmanager
 import time as tme
 import logging
@@ -86,8 +89,11 @@ class DatabaseManipulate(DatabaseConfig):
                     with conn.cursor() as cur:
                         extras.execute_values(cur, query, tuples)
                     conn.commit()
+                    return True
+                return False
             except (Exception, psycopg2.DatabaseError) as error:
                 logger.error(f"Error: {error}")
+                return False
             finally:
                 if conn is not None:
                     conn.close()
@@ -107,6 +113,100 @@ class DatabaseManipulate(DatabaseConfig):
                 if conn is not None:
                     conn.close()
 
+    def create_search_index(self, table_name="land_tbl_raw_feeds"):
+        # Title matches (weight A) rank above content matches (weight B)
+        table = sql.Identifier(table_name)
+        commands = [
+            sql.SQL(
+                """
+                ALTER TABLE {table}
+                ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(content, '')), 'B')
+                ) STORED
+                """
+            ).format(table=table),
+            sql.SQL(
+                "CREATE INDEX IF NOT EXISTS {index} ON {table} USING GIN (search_vector)"
+            ).format(index=sql.Identifier(f"{table_name}_search_idx"), table=table),
+            sql.SQL(
+                "CREATE INDEX IF NOT EXISTS {index} ON {table} (published_date)"
+            ).format(
+                index=sql.Identifier(f"{table_name}_published_idx"), table=table
+            ),
+        ]
+        self.run_ddl_commands(commands)
+
+    def search_feeds(
+        self,
+        query: str,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        page: int = 1,
+        page_size: int = 20,
+        table_name: str = "land_tbl_raw_feeds",
+    ) -> Optional[pd.DataFrame]:
+        """Rank rows matching a web-style query, e.g. '"chapel hill" -traffic'"""
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must both be at least 1")
+
+        # published_after is inclusive and published_before is exclusive
+        filters = [sql.SQL("search_vector @@ search_query")]
+        params = {
+            "query": query,
+            "limit": page_size,
+            "offset": (page - 1) * page_size,
+        }
+        if published_after is not None:
+            filters.append(sql.SQL("published_date >= %(published_after)s"))
+            params["published_after"] = published_after
+        if published_before is not None:
+            filters.append(sql.SQL("published_date < %(published_before)s"))
+            params["published_before"] = published_before
+
+        # Headlines are only built for the page being returned, not every match
+        search_query = sql.SQL(
+            """
+            SELECT table_id, published_date, url, author, title, rank,
+                ts_headline('english', content, search_query,
+                    'MaxFragments=2, MinWords=15, MaxWords=35') AS snippet
+            FROM (
+                SELECT table_id, published_date, url, author, title, content,
+                    search_query, ts_rank_cd(search_vector, search_query) AS rank
+                FROM {table}, websearch_to_tsquery('english', %(query)s) AS search_query
+                WHERE {filters}
+                ORDER BY rank DESC, published_date DESC, table_id
+                LIMIT %(limit)s OFFSET %(offset)s
+            ) AS matches
+            ORDER BY rank DESC, published_date DESC, table_id
+            """
+        ).format(
+            table=sql.Identifier(table_name), filters=sql.SQL(" AND ").join(filters)
+        )
+        columns = [
+            "table_id",
+            "published_date",
+            "url",
+            "author",
+            "title",
+            "rank",
+            "snippet",
+        ]
+
+        with timer(f"Searching {table_name} for {query!r}"):
+            try:
+                conn = self.connect_to_postgres()
+                if conn is not None:
+                    with conn.cursor() as cur:
+                        cur.execute(search_query, params)
+                        return pd.DataFrame(cur.fetchall(), columns=columns)
+            except (Exception, psycopg2.DatabaseError) as error:
+                logger.error(f"Error: {error}")
+            finally:
+                if conn is not None:
+                    conn.close()
+
 
 class NoSectionError(Exception):
     def __init__(self, message):
@@ -130,3 +230,4 @@ if __name__ == "__main__":
 
     pg_server = DatabaseManipulate("database.ini", "postgresql")
     pg_server.run_ddl_commands(create_landing_table_command)
+    pg_server.create_search_index("land_tbl_raw_feeds")
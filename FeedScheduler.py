@@ -0,0 +1,227 @@
+import asyncio
+import calendar
+import logging
+import random
+import statistics
+import time as tme
+from contextlib import contextmanager
+from RssPull import RssPull, DataCleaner
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def timer(label):
+    start = tme.time()
+    try:
+        yield
+    finally:
+        end = tme.time()
+    time = round(end - start, 2)
+    logger.info(f"{label}: {time} seconds")
+
+
+class FeedSchedule:
+    def __init__(
+        self,
+        url,
+        default_interval=30 * 60,
+        min_interval=5 * 60,
+        max_interval=24 * 60 * 60,
+        jitter=0.1,
+    ) -> None:
+        self.url = url
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.interval = default_interval
+        self.failures = 0
+        self.seen_urls = set()
+        # Seconds between polls implied by sy:updatePeriod / sy:updateFrequency
+        self.update_periods = {
+            "hourly": 60 * 60,
+            "daily": 24 * 60 * 60,
+            "weekly": 7 * 24 * 60 * 60,
+            "monthly": 30 * 24 * 60 * 60,
+            "yearly": 365 * 24 * 60 * 60,
+        }
+        # How much to stretch the interval after a poll that found nothing new
+        self.idle_growth = 1.5
+        self.max_observed_entries = 20
+
+    def clamp(self, seconds):
+        return max(self.min_interval, min(self.max_interval, seconds))
+
+    def ttl_hint(self, feed):
+        # RSS <ttl> is the number of minutes a feed may be cached before refreshing
+        try:
+            return int(feed.feed.get("ttl")) * 60
+        except (TypeError, ValueError):
+            return None
+
+    def update_period_hint(self, feed):
+        period = self.update_periods.get(
+            str(feed.feed.get("sy_updateperiod", "")).strip().lower()
+        )
+        if period is None:
+            return None
+        try:
+            frequency = max(int(feed.feed.get("sy_updatefrequency", 1)), 1)
+        except (TypeError, ValueError):
+            frequency = 1
+        return period / frequency
+
+    def observed_interval(self, feed):
+        # Median gap between the most recent entries is the feed's publish rate
+        timestamps = sorted(
+            (
+                calendar.timegm(item.published_parsed)
+                for item in feed.entries
+                if item.get("published_parsed") is not None
+            ),
+            reverse=True,
+        )[: self.max_observed_entries]
+
+        gaps = [
+            newer - older
+            for newer, older in zip(timestamps, timestamps[1:])
+            if newer > older
+        ]
+        return statistics.median(gaps) if gaps else None
+
+    def update_from_feed(self, feed, new_items):
+        self.failures = 0
+
+        observed = self.observed_interval(feed)
+        hinted = self.update_period_hint(feed)
+        ttl = self.ttl_hint(feed)
+
+        if new_items == 0 and self.seen_urls:
+            # Nothing new since the last poll, so back off gradually
+            interval = self.interval * self.idle_growth
+        elif observed is not None:
+            interval = observed
+        elif hinted is not None:
+            interval = hinted
+        else:
+            interval = self.default_interval
+
+        # Never poll more often than the publisher asked us to cache for
+        if ttl is not None:
+            interval = max(interval, ttl)
+
+        self.interval = self.clamp(interval)
+        self.seen_urls = {item.get("link", "Unknown link") for item in feed.entries}
+
+    def record_failure(self):
+        self.failures += 1
+
+    def next_delay(self):
+        delay = self.clamp(self.interval * 2**self.failures)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class FeedPoller:
+    def __init__(
+        self,
+        feed_list,
+        pg_server,
+        table_name="land_tbl_raw_feeds",
+        post_load_hooks=None,
+        startup_spread=60,
+        fetch_policy=None,
+        **schedule_kwargs,
+    ) -> None:
+        # These objects live for the lifetime of the daemon and are shared by every feed
+        self.rss_pull = RssPull(feed_list, fetch_policy)
+        self.preprocessor = DataCleaner()
+        self.pg_server = pg_server
+        self.table_name = table_name
+        self.post_load_hooks = post_load_hooks or []
+        self.startup_spread = startup_spread
+        self.schedules = [FeedSchedule(url, **schedule_kwargs) for url in feed_list]
+        # How far back to look for already loaded items when the daemon starts
+        self.seed_window = "2 days"
+
+    def is_failed_fetch(self, feed):
+        return bool(feed.get("bozo")) and not feed.entries
+
+    def seed_seen_urls(self):
+        # Without this every restart would reload the last 24 hours of items,
+        # since land_tbl_raw_feeds has no unique constraint on url
+        query = """SELECT DISTINCT url FROM %s
+                    WHERE extraction_date >= now() - interval '%s'""" % (
+            self.table_name,
+            self.seed_window,
+        )
+        loaded = self.pg_server.pg_to_pd_dataframe(query, ["url"])
+        if loaded is None:
+            logger.warning("Unable to seed seen URLs, recent items may be reloaded")
+            return
+
+        seen_urls = set(loaded["url"])
+        for schedule in self.schedules:
+            schedule.seen_urls = seen_urls
+        logger.info(f"Seeded {len(seen_urls)} already loaded URL(s)")
+
+    def run_hooks(self, load_to_pg):
+        # The rows are already committed, so a failing hook must not fail the poll
+        for hook in self.post_load_hooks:
+            try:
+                hook(load_to_pg)
+            except Exception as error:
+                logger.error(f"Post-load hook {hook.__name__} failed: {error}")
+
+    def poll_feed(self, schedule):
+        with timer(f"Polling {schedule.url}"):
+            feed, feed_data = self.rss_pull.pull_single_feed(
+                schedule.url, skip_urls=schedule.seen_urls
+            )
+            if self.is_failed_fetch(feed):
+                raise RuntimeError(
+                    f"Unable to fetch {schedule.url}: {feed.get('bozo_exception')}"
+                )
+
+            new_items = len(feed_data["urls"])
+            load_to_pg = None
+            if new_items > 0:
+                load_to_pg = self.preprocessor.prepare_for_landing(feed_data)
+                if not load_to_pg.empty:
+                    inserted = self.pg_server.insert_pd_dataframe(
+                        load_to_pg, self.table_name
+                    )
+                    # Failing here leaves seen_urls untouched so the items are retried
+                    if not inserted:
+                        raise RuntimeError(f"Unable to insert into {self.table_name}")
+
+            # Mark the items seen as soon as they are committed
+            schedule.update_from_feed(feed, new_items)
+
+            if load_to_pg is not None and not load_to_pg.empty:
+                self.run_hooks(load_to_pg)
+            return new_items
+
+    async def poll_forever(self, schedule):
+        # Stagger the first poll so every feed is not requested at once
+        await asyncio.sleep(random.uniform(0, self.startup_spread))
+
+        while True:
+            try:
+                new_items = await asyncio.to_thread(self.poll_feed, schedule)
+                logger.info(f"{schedule.url}: {new_items} new item(s)")
+            except Exception as error:
+                schedule.record_failure()
+                logger.error(f"{schedule.url} failed ({schedule.failures}x): {error}")
+
+            delay = schedule.next_delay()
+            minutes = round(delay / 60, 1)
+            logger.info(f"Next poll of {schedule.url} in {minutes} minutes")
+            await asyncio.sleep(delay)
+
+    async def run(self):
+        await asyncio.to_thread(self.seed_seen_urls)
+        await asyncio.gather(
+            *(self.poll_forever(schedule) for schedule in self.schedules)
+        )
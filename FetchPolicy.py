@@ -0,0 +1,346 @@
+import logging
+import random
+import threading
+import time as tme
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sites such as reddit answer the default python-requests agent with 429s
+default_user_agent = "RTP-Radar/1.0 (+https://github.com/brettv30/RTP-Radar)"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, cooldown=300, clock=tme.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.half_open_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            # Once the cooldown has passed exactly one probe request is let through
+            # (half-open); everyone else is rejected until it reports back
+            if self.half_open_in_flight:
+                return False
+            if self.clock() - self.opened_at < self.cooldown:
+                return False
+            self.half_open_in_flight = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.half_open_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            self.half_open_in_flight = False
+            if (
+                self.opened_at is not None
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                self.opened_at = self.clock()
+
+    def release(self):
+        # The request ended without telling us anything about the host
+        with self.lock:
+            self.half_open_in_flight = False
+
+
+class FetchResult:
+    def __init__(self, url, status_code, headers, content, encoding) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HostStats:
+    def __init__(self, max_samples=1000) -> None:
+        self.latencies = deque(maxlen=max_samples)
+        self.requests = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    def record_latency(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def record_outcome(self, success):
+        with self.lock:
+            self.requests += 1
+            if not success:
+                self.failures += 1
+
+    def percentile(self, ordered, pct):
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return round(ordered[index], 3)
+
+    def summary(self):
+        with self.lock:
+            ordered = sorted(self.latencies)
+            summary = {"requests": self.requests, "failures": self.failures}
+        if ordered:
+            summary.update(
+                {
+                    "p50_seconds": self.percentile(ordered, 50),
+                    "p95_seconds": self.percentile(ordered, 95),
+                    "max_seconds": round(ordered[-1], 3),
+                }
+            )
+        return summary
+
+
+class FetchPolicy:
+    def __init__(
+        self,
+        request_timeout=10,
+        run_deadline=None,
+        max_retries=2,
+        backoff_base=0.5,
+        backoff_max=8,
+        hedge_after=None,
+        failure_threshold=5,
+        cooldown=300,
+        session=None,
+        user_agent=default_user_agent,
+        chunk_size=1024,
+        clock=tme.monotonic,
+    ) -> None:
+        self.request_timeout = request_timeout
+        # Seconds a whole pull may spend fetching, see new_run_deadline
+        self.run_deadline = run_deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Seconds to wait on a response before sending a duplicate request
+        self.hedge_after = hedge_after
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.session = session
+        self.user_agent = user_agent
+        self.chunk_size = chunk_size
+        self.clock = clock
+        self.retryable_statuses = {429, 500, 502, 503, 504}
+        self.breakers = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def get_session(self):
+        # requests is imported on first use rather than at module load
+        with self.lock:
+            if self.session is None:
+                import requests
+
+                self.session = requests.Session()
+                self.session.headers["User-Agent"] = self.user_agent
+            return self.session
+
+    def new_run_deadline(self):
+        # Each pull asks for its own deadline and passes it to get(), so
+        # concurrent or later pulls never share a spent budget
+        if self.run_deadline is None:
+            return None
+        return self.clock() + self.run_deadline
+
+    def breaker_for(self, host):
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(
+                    self.failure_threshold, self.cooldown, self.clock
+                )
+            return self.breakers[host]
+
+    def stats_for(self, host):
+        with self.lock:
+            if host not in self.stats:
+                self.stats[host] = HostStats()
+            return self.stats[host]
+
+    def host_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+        return {host: host_stats.summary() for host, host_stats in stats.items()}
+
+    def attempt_timeout(self, url, run_ends_at):
+        if run_ends_at is None:
+            return self.request_timeout
+        remaining = run_ends_at - self.clock()
+        if remaining <= 0:
+            raise DeadlineExceededError(f"Run deadline exceeded before fetching {url}")
+        return min(self.request_timeout, remaining)
+
+    def backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return delay * random.uniform(0.5, 1)
+
+    def timed_get(self, url, timeout, cancelled):
+        ends_at = self.clock() + timeout
+        response = self.get_session().get(url, timeout=timeout, stream=True)
+        try:
+            if response.status_code in self.retryable_statuses:
+                raise RetryableStatusError(
+                    f"{response.status_code} response from {url}",
+                    response.status_code,
+                )
+
+            # Read the body in chunks so a trickling server cannot outlive the
+            # deadline and an abandoned request stops at the next chunk
+            chunks = []
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                if cancelled.is_set():
+                    raise DeadlineExceededError(f"Request to {url} was abandoned")
+                if self.clock() > ends_at:
+                    raise DeadlineExceededError(
+                        f"Body of {url} not received within {timeout} seconds"
+                    )
+                chunks.append(chunk)
+
+            return FetchResult(
+                response.url,
+                response.status_code,
+                response.headers,
+                b"".join(chunks),
+                response.encoding,
+            )
+        finally:
+            response.close()
+
+    def start_request(self, url, timeout, cancelled):
+        # Every request runs on its own daemon thread, so one left running after a
+        # lost hedge or a missed deadline never delays other hosts or process exit
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self.timed_get(url, timeout, cancelled))
+            except BaseException as error:
+                future.set_exception(error)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def attempt(self, url, timeout):
+        ends_at = self.clock() + timeout
+        cancelled = threading.Event()
+        futures = {self.start_request(url, timeout, cancelled)}
+
+        try:
+            if self.hedge_after is not None and self.hedge_after < timeout:
+                done, _ = wait(futures, timeout=self.hedge_after)
+                if not done:
+                    logger.info(f"Hedging slow request to {url}")
+                    futures.add(
+                        self.start_request(url, timeout - self.hedge_after, cancelled)
+                    )
+
+            last_error = None
+            while futures:
+                done, futures = wait(
+                    futures,
+                    timeout=max(ends_at - self.clock(), 0),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    break
+                for future in done:
+                    try:
+                        # First successful response wins
+                        return future.result()
+                    except Exception as error:
+                        last_error = error
+
+            if last_error is not None and not futures:
+                raise last_error
+            raise DeadlineExceededError(
+                f"No response from {url} within {timeout} seconds"
+            )
+        finally:
+            # Stop any request that is still running
+            cancelled.set()
+
+    def is_host_failure(self, error, timeout):
+        # A timeout only says the host is slow if it was given the full
+        # request_timeout rather than whatever was left of the run deadline
+        if isinstance(error, DeadlineExceededError):
+            return timeout >= self.request_timeout
+        # requests' exceptions all derive from OSError; the ones that also derive
+        # from ValueError (MissingSchema, InvalidURL, ...) are our own mistakes
+        return isinstance(error, (RetryableStatusError, OSError)) and not isinstance(
+            error, ValueError
+        )
+
+    def get(self, url, run_ends_at=None):
+        host = urlparse(url).netloc
+        breaker = self.breaker_for(host)
+        host_stats = self.stats_for(host)
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            timeout = self.attempt_timeout(url, run_ends_at)
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit open for {host}, skipping {url}")
+
+            start = self.clock()
+            try:
+                response = self.attempt(url, timeout)
+                breaker.record_success()
+                host_stats.record_outcome(True)
+                return response
+            except Exception as error:
+                last_error = error
+                host_stats.record_outcome(False)
+                logger.warning(f"Attempt {attempt + 1} for {url} failed: {error}")
+                if not self.is_host_failure(error, timeout):
+                    # Retrying cannot help a bad URL or an exhausted run deadline
+                    breaker.release()
+                    break
+                breaker.record_failure()
+            finally:
+                # Timeouts are recorded too, so p95/max reflect stalled hosts
+                host_stats.record_latency(self.clock() - start)
+
+            if attempt < self.max_retries:
+                delay = self.backoff(attempt)
+                if run_ends_at is not None and self.clock() + delay >= run_ends_at:
+                    break
+                tme.sleep(delay)
+
+        raise FetchError(f"Unable to fetch {url}: {last_error}")
+
+
+class FetchError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class RetryableStatusError(FetchError):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenError(FetchError):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class DeadlineExceededError(FetchError):
+    def __init__(self, message):
+        super().__init__(message)
@@ -1,14 +1,12 @@
 import logging
 from urllib.parse import urlparse
 import concurrent.futures
-from bs4 import BeautifulSoup
-import feedparser
-import requests
 import pandas as pd
 from contextlib import contextmanager
 import time as tme
 from datetime import date, datetime, timedelta
 import pytz
+from FetchPolicy import FetchPolicy, FetchError
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -122,6 +120,38 @@ class DataCleaner:
 
         return last_24_dataframe
 
+    def prepare_for_landing(self, feed_data):
+        # Turn RssPull output into the last 24 hours of rows for land_tbl_raw_feeds
+        df_cols = list(feed_data.keys())
+        initial_df = pd.DataFrame(feed_data, columns=df_cols)
+
+        cleaned_dates_df = self.clean_published_dates(initial_df)
+
+        last_24_df = self.filter_for_last_24_hrs(cleaned_dates_df)
+
+        load_to_pg = last_24_df[
+            [
+                "extracted_date",
+                "formatted_eastern_published",
+                "urls",
+                "authors",
+                "title",
+                "content",
+            ]
+        ].copy()
+
+        load_to_pg.rename(
+            columns={
+                "extracted_date": "extraction_date",
+                "formatted_eastern_published": "published_date",
+                "urls": "url",
+                "authors": "author",
+            },
+            inplace=True,
+        )
+
+        return load_to_pg
+
     def filter_for_populated_content(self, dataframe):
         with timer("Filtering for populated content"):
             # Filter the DataFrame for rows where 'content' is not empty
@@ -131,10 +161,21 @@ class DataCleaner:
 
 
 class URLParser:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, fetch_policy=None) -> None:
+        self.fetch_policy = fetch_policy if fetch_policy is not None else FetchPolicy()
+
+    def fetch_page(self, url, run_ends_at=None):
+        try:
+            return self.fetch_policy.get(url, run_ends_at).text
+        except FetchError as error:
+            logger.warning(error)
+            return None
 
     def parse_page(self, page):
+        # bs4 and feedparser are only imported once a page or feed is parsed,
+        # so scripts that just use DataCleaner start up quickly
+        from bs4 import BeautifulSoup
+
         return BeautifulSoup(page, "html.parser")
 
     def is_valid_url(self, url):
@@ -144,9 +185,11 @@ class URLParser:
         except Exception:
             return False
 
-    def extract_url_content(self, url):
+    def extract_url_content(self, url, run_ends_at=None):
         if self.is_valid_url(url):
-            page = requests.get(url).text
+            page = self.fetch_page(url, run_ends_at)
+            if page is None:
+                return None
             soup = self.parse_page(page)
             item = soup.find_all("p")
             return " ".join([" ".join(text.get_text().split()) for text in item])
@@ -154,9 +197,11 @@ class URLParser:
             logger.warning(f"Invalid URL - Content: {url}")
             return None
 
-    def extract_url_title(self, url):
+    def extract_url_title(self, url, run_ends_at=None):
         if self.is_valid_url(url):
-            page = requests.get(url).text
+            page = self.fetch_page(url, run_ends_at)
+            if page is None:
+                return None
             soup = self.parse_page(page)
             description = soup.find_all("h1")
             header = "".join(f"{content.get_text()}" for content in description)
@@ -168,43 +213,78 @@ class URLParser:
 
 
 class RssPull(URLParser):
-    def __init__(self, feed_list):
+    def __init__(self, feed_list, fetch_policy=None):
+        super().__init__(fetch_policy)
         self.feed_list = feed_list
 
-    def parse_feed(self, url):
-        return feedparser.parse(url)
+    def parse_feed(self, url, run_ends_at=None):
+        import feedparser
+
+        try:
+            response = self.fetch_policy.get(url, run_ends_at)
+        except FetchError as error:
+            logger.warning(error)
+            # Mirror what feedparser returns for a feed it could not download
+            return feedparser.FeedParserDict(
+                bozo=1, bozo_exception=error, entries=[], feed={}
+            )
+
+        # content-location lets feedparser resolve relative links against the feed URL
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        headers["content-location"] = response.url
+        return feedparser.parse(response.content, response_headers=headers)
 
     def pull_feed(self):
-        all_urls = []
-        all_published_dates = []
-        all_authors = []
-        all_titles = []
-        all_content = []
+        run_ends_at = self.fetch_policy.new_run_deadline()
+        feed_data = self.new_feed_data()
 
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.parse_feed, url) for url in self.feed_list]
+            futures = [
+                executor.submit(self.parse_feed, url, run_ends_at)
+                for url in self.feed_list
+            ]
 
             for future in concurrent.futures.as_completed(futures):
                 feed = future.result()
+                self.extract_entries(feed, feed_data, run_ends_at=run_ends_at)
+
+        for host, stats in self.fetch_policy.host_stats().items():
+            logger.info(f"Fetch latency for {host}: {stats}")
 
-                for item in feed.entries:
-                    all_published_dates.append(self.extract_published_date(item))
-                    all_authors.append(self.extract_authors(item))
-                    all_urls.append(self.extract_urls(item))
-                    all_titles.append(self.extract_titles(item))
-                    all_content.append(self.extract_content(item))
+        return feed_data
 
-        today = date.today()
+    def pull_single_feed(self, url, skip_urls=None):
+        # Returns the parsed feed alongside its entries so callers can inspect
+        # feed level metadata (ttl, sy:updatePeriod, entry timestamps).
+        # Entries whose link is in skip_urls are not extracted again.
+        run_ends_at = self.fetch_policy.new_run_deadline()
+        feed = self.parse_feed(url, run_ends_at)
+        feed_data = self.new_feed_data()
+        self.extract_entries(feed, feed_data, skip_urls, run_ends_at)
+        return feed, feed_data
 
+    def new_feed_data(self):
         return {
-            "extracted_date": today,
-            "published": all_published_dates,
-            "authors": all_authors,
-            "urls": all_urls,
-            "title": all_titles,
-            "content": all_content,
+            "extracted_date": date.today(),
+            "published": [],
+            "authors": [],
+            "urls": [],
+            "title": [],
+            "content": [],
         }
 
+    def extract_entries(self, feed, feed_data, skip_urls=None, run_ends_at=None):
+        for item in feed.entries:
+            if skip_urls is not None and self.extract_urls(item) in skip_urls:
+                continue
+            feed_data["published"].append(self.extract_published_date(item))
+            feed_data["authors"].append(self.extract_authors(item))
+            feed_data["urls"].append(self.extract_urls(item))
+            feed_data["title"].append(self.extract_titles(item, run_ends_at))
+            feed_data["content"].append(self.extract_content(item, run_ends_at))
+
+        return feed_data
+
     def extract_published_date(self, item):
         with timer("Extracting publish date"):
             return item.published if hasattr(item, "published") else "Unknown date"
@@ -217,14 +297,14 @@ class RssPull(URLParser):
         with timer("Extracting URLs"):
             return item.link if hasattr(item, "link") else "Unknown link"
 
-    def extract_titles(self, item):
+    def extract_titles(self, item, run_ends_at=None):
         with timer("Extracting titles"):
             if hasattr(item, "title"):
                 return item.title
-            title_results = self.extract_url_title(item.link)
+            title_results = self.extract_url_title(item.link, run_ends_at)
             return title_results if title_results is not None else "Unknown title"
 
-    def extract_content(self, item):
+    def extract_content(self, item, run_ends_at=None):
         with timer("Extracting content"):
             if hasattr(item, "content") and "reddit" in item.link:
                 # Extracting the HTML part from your list element
@@ -246,7 +326,7 @@ class RssPull(URLParser):
                 and "abc11" in item.link
                 or not hasattr(item, "content")
             ):
-                content_results = self.extract_url_content(item.link)
+                content_results = self.extract_url_content(item.link, run_ends_at)
                 return content_results if content_results is not None else ""
             else:
                 return item.content
@@ -0,0 +1,126 @@
+import os
+import sys
+import argparse
+import subprocess
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Startup budget in milliseconds for each entry point, on top of bare interpreter startup
+entry_points = {
+    "FetchPolicy": ("module", "FetchPolicy", 150),
+    "ContentExtensions": ("module", "ContentExtensions", 150),
+    "RssPull": ("module", "RssPull", 1500),
+    "DatabaseInteractions": ("module", "DatabaseInteractions", 1500),
+    "FeedScheduler": ("module", "FeedScheduler", 1500),
+    "pull_and_load": ("script", "scripts/pull_and_load.py", 2000),
+    "extract_and_preprocess": ("script", "scripts/extract_and_preprocess.py", 2000),
+    "run_poller": ("script", "scripts/run_poller.py", 2000),
+}
+
+# None of these should be imported until content is actually enriched or summarized
+heavy_modules = [
+    "torch",
+    "transformers",
+    "keybert",
+    "textblob",
+    "langchain",
+    "langchain_openai",
+    "tiktoken",
+    "dotenv",
+]
+
+
+def import_statement(kind, target):
+    if kind == "module":
+        return f"import {target}"
+    # run_name other than __main__ executes the script's imports but not its body
+    return f"import runpy; runpy.run_path({target!r}, run_name='import_benchmark')"
+
+
+def parse_importtime(stderr):
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    total_us = 0
+    imported = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|", 2)
+        cumulative = int(cumulative)
+        imported[name.strip()] = cumulative
+        # Top level imports are not indented, nested ones are already counted in them
+        if not name.startswith("  "):
+            total_us += cumulative
+    return total_us, imported
+
+
+def measure(statement):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=repo_root,
+        env={**os.environ, "PYTHONPATH": repo_root},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def benchmark(statement, repeat, baseline_modules=()):
+    runs = [measure(statement) for _ in range(repeat)]
+    total_us, imported = min(runs, key=lambda run: run[0])
+    heavy = sorted({module.split(".")[0] for module in imported} & set(heavy_modules))
+    # Modules loaded by bare interpreter startup say nothing about the entry point
+    own_imports = {
+        module: cumulative_us
+        for module, cumulative_us in imported.items()
+        if module not in baseline_modules
+    }
+    slowest = sorted(own_imports.items(), key=lambda item: item[1], reverse=True)[:5]
+    return total_us / 1000, heavy, slowest, imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Guard the import time of each RTP-Radar entry point"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget, e.g. for slower CI machines",
+    )
+    parser.add_argument("entry_points", nargs="*", default=list(entry_points))
+    args = parser.parse_args()
+
+    # Interpreter startup (site, encodings, ...) is subtracted from every entry point
+    baseline_ms, _, _, baseline_modules = benchmark("pass", args.repeat)
+
+    failures = []
+    for name in args.entry_points:
+        kind, target, budget_ms = entry_points[name]
+        budget_ms *= args.budget_scale
+        try:
+            elapsed_ms, heavy, slowest, _ = benchmark(
+                import_statement(kind, target), args.repeat, baseline_modules
+            )
+        except RuntimeError as error:
+            failures.append(name)
+            print(f"{name}: could not be imported ({error})")
+            continue
+
+        elapsed_ms -= baseline_ms
+        status = "ok"
+        if heavy:
+            status = f"imports {', '.join(heavy)} eagerly"
+        elif elapsed_ms > budget_ms:
+            status = "over budget"
+        if status != "ok":
+            failures.append(name)
+
+        print(f"{name}: {elapsed_ms:.0f} ms (budget {budget_ms:.0f} ms) - {status}")
+        for module, cumulative_us in slowest:
+            print(f"    {module}: {cumulative_us / 1000:.0f} ms")
+
+    sys.exit(1 if failures else 0)
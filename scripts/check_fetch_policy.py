@@ -0,0 +1,273 @@
+import os
+import sys
+import threading
+import time as tme
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from FetchPolicy import FetchPolicy, FetchError, CircuitOpenError
+
+
+# Local stand-in for slow and failing sites, exercised without touching the network
+class StandInHandler(BaseHTTPRequestHandler):
+    def send_body(self, status, body=b"ok"):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client abandoned this request, e.g. it lost a hedge
+            pass
+
+    def do_GET(self):
+        hits = self.server.record_hit(self.path)
+
+        if self.path == "/ok":
+            self.send_body(200)
+        elif self.path == "/stall":
+            tme.sleep(2)
+            self.send_body(200)
+        elif self.path == "/slow-once":
+            # Only the first request is slow, so a hedged duplicate wins
+            if hits == 1:
+                tme.sleep(1)
+            self.send_body(200)
+        elif self.path == "/flaky":
+            self.send_body(503 if hits <= 2 else 200)
+        elif self.path == "/down":
+            # Slow enough that concurrent callers arrive while the probe is in flight
+            tme.sleep(0.3)
+            self.send_body(503)
+        elif self.path == "/fail":
+            self.send_body(503 if self.server.failing else 200)
+        elif self.path == "/trickle":
+            body = b"x" * 100
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                for byte in body:
+                    self.wfile.write(bytes([byte]))
+                    self.wfile.flush()
+                    tme.sleep(0.05)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        else:
+            self.send_body(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.hits = {}
+        self.failing = True
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def record_hit(self, path):
+        with self.lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            return self.hits[path]
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+
+def check_timeout(server):
+    policy = FetchPolicy(request_timeout=0.3, max_retries=0)
+    start = tme.monotonic()
+    try:
+        policy.get(server.url("/stall"))
+        return "stalled request did not time out"
+    except FetchError:
+        pass
+    elapsed = tme.monotonic() - start
+    if elapsed > 1:
+        return f"timeout took {elapsed:.2f} seconds"
+
+    stats = policy.host_stats()[f"127.0.0.1:{server.server_port}"]
+    if stats.get("max_seconds", 0) < 0.3:
+        return f"timed out request missing from latency stats: {stats}"
+
+
+def check_retries(server):
+    policy = FetchPolicy(max_retries=2, backoff_base=0.01)
+    response = policy.get(server.url("/flaky"))
+    if response.status_code != 200:
+        return f"expected 200 after retries, got {response.status_code}"
+    if server.hits["/flaky"] != 3:
+        return f"expected 3 requests, server saw {server.hits['/flaky']}"
+
+
+def check_hedging(server):
+    policy = FetchPolicy(request_timeout=2, hedge_after=0.1, max_retries=0)
+    start = tme.monotonic()
+    response = policy.get(server.url("/slow-once"))
+    elapsed = tme.monotonic() - start
+    if response.text != "ok" or elapsed > 0.5:
+        return f"hedged request took {elapsed:.2f} seconds"
+
+
+def check_circuit_breaker(server):
+    policy = FetchPolicy(
+        max_retries=2, backoff_base=0.01, failure_threshold=3, cooldown=0.5
+    )
+    url = server.url("/fail")
+
+    try:
+        policy.get(url)
+        return "failing host did not raise"
+    except CircuitOpenError:
+        return "circuit opened before the retries were used up"
+    except FetchError:
+        pass
+
+    hits = server.hits["/fail"]
+    try:
+        policy.get(url)
+        return "circuit did not open"
+    except CircuitOpenError:
+        pass
+    if server.hits["/fail"] != hits:
+        return "open circuit still sent a request"
+
+    # Half-open: one trial request after the cooldown, which re-opens on failure
+    tme.sleep(0.6)
+    try:
+        policy.get(url)
+    except CircuitOpenError:
+        pass
+    except FetchError:
+        pass
+    if server.hits["/fail"] != hits + 1:
+        return f"half-open circuit sent {server.hits['/fail'] - hits} request(s)"
+
+    # Once the host recovers the trial request succeeds and closes the circuit
+    server.failing = False
+    tme.sleep(0.6)
+    policy.get(url)
+    policy.get(url)
+
+
+def check_single_half_open_probe(server):
+    policy = FetchPolicy(max_retries=0, failure_threshold=1, cooldown=0.3)
+    url = server.url("/down")
+
+    try:
+        policy.get(url)
+    except FetchError:
+        pass
+    tme.sleep(0.4)
+
+    # Several feeds on the same host hit the half-open circuit at once
+    hits = server.hits["/down"]
+    rejected = []
+
+    def fetch():
+        try:
+            policy.get(url)
+        except CircuitOpenError:
+            rejected.append(url)
+        except FetchError:
+            pass
+
+    threads = [threading.Thread(target=fetch) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    probes = server.hits["/down"] - hits
+    if probes != 1 or len(rejected) != 4:
+        return f"half-open circuit let {probes} of 5 concurrent requests through"
+
+
+def check_client_side_failures(server):
+    policy = FetchPolicy(request_timeout=1, run_deadline=0.2, max_retries=2)
+
+    # A timeout cut short by the run deadline says nothing about the host
+    try:
+        policy.get(server.url("/stall"), policy.new_run_deadline())
+        return "stalled request did not time out"
+    except FetchError:
+        pass
+    host = f"127.0.0.1:{server.server_port}"
+    if policy.breaker_for(host).consecutive_failures != 0:
+        return "run deadline timeout was charged to the host"
+
+    # A fresh run gets a fresh deadline
+    policy.get(server.url("/ok"), policy.new_run_deadline())
+
+    # Malformed URLs are neither retried nor charged to a breaker
+    try:
+        policy.get("127.0.0.1/no-scheme")
+        return "malformed URL did not raise"
+    except FetchError:
+        pass
+    stats = policy.host_stats()[""]
+    if stats["requests"] != 1 or policy.breaker_for("").consecutive_failures != 0:
+        return f"malformed URL was retried or charged to a breaker: {stats}"
+
+
+def check_slow_host_isolation(slow_server, healthy_server):
+    # Byte sized chunks let the abandoned requests notice cancellation straight away
+    policy = FetchPolicy(
+        request_timeout=0.3, hedge_after=0.1, max_retries=0, chunk_size=1
+    )
+    threads_before = threading.active_count()
+
+    try:
+        policy.get(slow_server.url("/trickle"))
+        return "trickling body did not time out"
+    except FetchError:
+        pass
+
+    policy.get(healthy_server.url("/ok"))
+    healthy_host = f"127.0.0.1:{healthy_server.server_port}"
+    if policy.breaker_for(healthy_host).consecutive_failures != 0:
+        return "healthy host was charged for the slow host"
+
+    # Abandoned requests stop at their next chunk instead of reading the whole body
+    tme.sleep(0.5)
+    lingering = threading.active_count() - threads_before
+    if lingering > 0:
+        return f"{lingering} abandoned request thread(s) still running"
+
+
+if __name__ == "__main__":
+    slow_server = StandInServer()
+    healthy_server = StandInServer()
+
+    checks = {
+        "timeout": lambda: check_timeout(slow_server),
+        "retries": lambda: check_retries(slow_server),
+        "hedging": lambda: check_hedging(slow_server),
+        "circuit breaker": lambda: check_circuit_breaker(slow_server),
+        "single half-open probe": lambda: check_single_half_open_probe(slow_server),
+        "client side failures": lambda: check_client_side_failures(slow_server),
+        "slow host isolation": lambda: check_slow_host_isolation(
+            slow_server, healthy_server
+        ),
+    }
+
+    failures = []
+    for name, check in checks.items():
+        try:
+            problem = check()
+        except Exception as error:
+            problem = f"raised {error!r}"
+        if problem:
+            failures.append(name)
+        print(f"{name}: {'FAIL - ' + problem if problem else 'ok'}")
+
+    sys.exit(1 if failures else 0)
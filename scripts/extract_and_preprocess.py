@@ -6,9 +6,9 @@ new_path = "C:\\Users\\Brett\\OneDrive\\Desktop\\RTP-Radar\\"
 if new_path not in sys.path:
     sys.path.append(new_path)
 
-from ContentExtensions import *
-from RssPull import *
-from DatabaseInteractions import *
+from ContentExtensions import ContentExtender, ContentSummarizer
+from RssPull import DataCleaner
+from DatabaseInteractions import DatabaseManipulate
 
 # Script used for postgres table extraction and data preprocessing
 if __name__ == "__main__":
@@ -5,8 +5,9 @@ new_path = "C:\\Users\\Brett\\OneDrive\\Desktop\\RTP-Radar\\"
 if new_path not in sys.path:
     sys.path.append(new_path)
 
-from RssPull import *
-from DatabaseInteractions import *
+from FetchPolicy import FetchPolicy
+from RssPull import RssPull, DataCleaner
+from DatabaseInteractions import DatabaseManipulate
 
 # Main script used to pull the RSS feeds in feed_list
 if __name__ == "__main__":
@@ -24,36 +25,12 @@ if __name__ == "__main__":
     pg_server = DatabaseManipulate("database.ini", "postgresql")
     preprocessor = DataCleaner()
 
-    new_rss_pull = RssPull(feed_list)
+    # Bound each request and the run as a whole so one stalled host cannot hold up the pull
+    fetch_policy = FetchPolicy(request_timeout=15, run_deadline=600, hedge_after=5)
+    new_rss_pull = RssPull(feed_list, fetch_policy)
     rss_feed_data = new_rss_pull.pull_feed()
 
-    df_cols = list(rss_feed_data.keys())
-    initial_df = pd.DataFrame(rss_feed_data, columns=df_cols)
-
-    cleaned_dates_df = preprocessor.clean_published_dates(initial_df)
-
-    last_24_df = preprocessor.filter_for_last_24_hrs(cleaned_dates_df)
-
-    load_to_pg = last_24_df[
-        [
-            "extracted_date",
-            "formatted_eastern_published",
-            "urls",
-            "authors",
-            "title",
-            "content",
-        ]
-    ].copy()
-
-    load_to_pg.rename(
-        columns={
-            "extracted_date": "extraction_date",
-            "formatted_eastern_published": "published_date",
-            "urls": "url",
-            "authors": "author",
-        },
-        inplace=True,
-    )
+    load_to_pg = preprocessor.prepare_for_landing(rss_feed_data)
 
     # Load Raw Data from the last 24 hours into postgres DB
     pg_server.insert_pd_dataframe(load_to_pg, "land_tbl_raw_feeds")
@@ -0,0 +1,55 @@
+import sys
+import argparse
+import asyncio
+
+new_path = "C:\\Users\\Brett\\OneDrive\\Desktop\\RTP-Radar\\"
+
+if new_path not in sys.path:
+    sys.path.append(new_path)
+
+from FeedScheduler import FeedPoller, logger
+from DatabaseInteractions import DatabaseManipulate
+
+# Long-running alternative to pull_and_load.py that polls each feed on its own schedule
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="Extract keywords for newly loaded content with a warm KeyBERT model",
+    )
+    args = parser.parse_args()
+
+    feed_list = [
+        "http://www.wral.com/news/rss/142/",
+        "https://www.durhamnc.gov/RSSFeed.aspx?ModID=76&CID=All-0",
+        "https://abc11.com/feed/",
+        "https://www.cbs17.com/app-feed/",
+        "https://www.dailytarheel.com/plugin/feeds/tag/pageOne",
+        "https://reddit.com/r/raleigh/new/.rss?sort=new",
+        "https://reddit.com/r/chapelhill/new/.rss?sort=new",
+        "https://reddit.com/r/bullcity/new/.rss?sort=new",
+    ]
+
+    pg_server = DatabaseManipulate("database.ini", "postgresql")
+
+    post_load_hooks = []
+    if args.enrich:
+        from ContentExtensions import ContentExtender
+
+        # Load the model once and reuse it for every poll
+        extender = ContentExtender()
+
+        def log_keywords(dataframe):
+            keywords = extender.get_keywords(dataframe["content"])
+            for url, url_keywords in zip(dataframe["url"], keywords):
+                logger.info(f"{url}: {url_keywords}")
+
+        post_load_hooks.append(log_keywords)
+
+    poller = FeedPoller(feed_list, pg_server, post_load_hooks=post_load_hooks)
+
+    try:
+        asyncio.run(poller.run())
+    except KeyboardInterrupt:
+        logger.info("Poller stopped.")